@@ -40,9 +40,13 @@ def create_app(config_class: type = Config) -> Flask:
     except ModuleNotFoundError:
         pass
 
+    # Fingerprinted static assets + gzip/brotli for dynamic responses
+    from . import assets
+    assets.init_app(app)
+
     # ── Import models & set user_loader ─────────────────────────
     # Do this *after* db.init_app(app) so table metadata binds correctly.
-    from .models import User, GuessLog, ScoreLog  # noqa: F401
+    from .models import User, GuessLog, ScoreLog, PlayerGuessStat, QuizScoreStat  # noqa: F401
 
     # Ensure tables exist for SQLite/local development
     with app.app_context():
@@ -54,6 +58,11 @@ def create_app(config_class: type = Config) -> Flask:
         if "time_taken" not in cols:
             db.session.execute(text("ALTER TABLE score_log ADD COLUMN time_taken INTEGER"))
             db.session.commit()
+        # create_all() skips indexes on tables that already exist
+        have = {ix["name"] for ix in insp.get_indexes("score_log")}
+        for ix in ScoreLog.__table__.indexes:
+            if ix.name not in have:
+                ix.create(db.engine)
 
     @login.user_loader
     def load_user(user_id: str):
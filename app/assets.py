@@ -0,0 +1,151 @@
+"""
+app/assets.py
+-------------
+Response compression and fingerprinted static assets.
+
+* Top-level files in ``app/static`` (style.css, avatar.png, …) are hashed
+  at startup and served from ``/assets/<name>.<hash>.<ext>`` with a
+  one-year ``immutable`` Cache-Control.  Compressed variants are built
+  once, in memory, so no per-request work is done for them.
+* Templates call ``asset_url('style.css')`` to get the fingerprinted URL.
+* Dynamic text/JSON responses above COMPRESS_MIN_SIZE are gzip- or
+  brotli-encoded (brotli only if the optional ``brotli`` package is
+  installed) according to the client's Accept-Encoding.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Blueprint, Response, abort, current_app, request, url_for
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+# logical name -> fingerprinted name, and fingerprinted name -> entry
+_manifest = {}
+_files = {}
+
+
+def _compressible(mimetype: str) -> bool:
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE)
+
+
+def _pick_encoding():
+    """Best encoding the client accepts: 'br', 'gzip' or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=min(level, 9))
+
+
+# ────────────────────────────────────────────────────────────────
+# Fingerprinted static files
+# ────────────────────────────────────────────────────────────────
+def build_manifest(static_dir: str) -> None:
+    """Hash and precompress every regular file directly in ``static_dir``."""
+    _manifest.clear()
+    _files.clear()
+    for fname in sorted(os.listdir(static_dir)):
+        path = os.path.join(static_dir, fname)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(fname)
+        hashed = f"{stem}.{digest}{ext}"
+        mimetype = mimetypes.guess_type(fname)[0] or "application/octet-stream"
+
+        variants = {None: data}
+        if _compressible(mimetype) and data:
+            # Static files are built once, so use maximum compression
+            variants["gzip"] = gzip.compress(data, compresslevel=9)
+            if brotli is not None:
+                variants["br"] = brotli.compress(data, quality=11)
+
+        _manifest[fname] = hashed
+        _files[hashed] = {"mimetype": mimetype, "etag": digest, "variants": variants}
+
+
+def asset_url(filename: str) -> str:
+    """URL for a static file; fingerprinted when it's in the manifest."""
+    hashed = _manifest.get(filename)
+    if hashed is None:
+        return url_for("static", filename=filename)
+    return url_for("assets.asset", filename=hashed)
+
+
+@bp.route("/<filename>")
+def asset(filename):
+    entry = _files.get(filename)
+    if entry is None:
+        abort(404)
+
+    variants = entry["variants"]
+    encoding = _pick_encoding()
+    if encoding not in variants:
+        encoding = "gzip" if "gzip" in variants and request.accept_encodings["gzip"] else None
+
+    resp = Response(variants[encoding], mimetype=entry["mimetype"])
+    # Each content-coding is a different representation and needs its own
+    # strong validator (RFC 9110 §8.8.3)
+    resp.set_etag({None: entry["etag"], "gzip": f"{entry['etag']}-gz",
+                   "br": f"{entry['etag']}-br"}[encoding])
+    resp.headers["Cache-Control"] = IMMUTABLE
+    if len(variants) > 1:
+        resp.vary.add("Accept-Encoding")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    return resp.make_conditional(request)
+
+
+# ────────────────────────────────────────────────────────────────
+# Dynamic response compression
+# ────────────────────────────────────────────────────────────────
+def compress_response(response):
+    """after_request hook: encode large text responses."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or not _compressible(response.mimetype)
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config.get("COMPRESS_MIN_SIZE", 500):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _pick_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(_compress(data, encoding, current_app.config.get("COMPRESS_LEVEL", 6)))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app) -> None:
+    build_manifest(app.static_folder)
+    app.register_blueprint(bp)
+    app.jinja_env.globals["asset_url"] = asset_url
+    app.after_request(compress_response)
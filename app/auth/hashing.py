@@ -0,0 +1,100 @@
+# app/auth/hashing.py
+# -------------------
+# Password hashing off the request thread.
+#
+# werkzeug's scrypt/PBKDF2 hashes are deliberately slow; running them in
+# the web worker lets a burst of logins starve the quiz routes.  Hashes
+# are sent to a small process pool instead, and a semaphore caps how many
+# jobs may be queued or running at once.  When the cap is hit callers get
+# HashPoolBusy straight away instead of piling up behind the pool.
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashPoolBusy(Exception):
+    """Raised when the hashing queue is full or a job times out."""
+
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_slots = None
+_method_prefix = {}
+
+
+def _cfg(key, default):
+    try:
+        return current_app.config.get(key, default)
+    except RuntimeError:  # outside an app context (scripts, shell)
+        return default
+
+
+def _get_pool():
+    """Return (executor, semaphore), creating them once per process.
+
+    Re-created after a fork so pre-forking servers don't share a pool.
+    """
+    global _pool, _pool_pid, _slots
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            workers = _cfg("HASH_POOL_WORKERS", 2)
+            _pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+            _slots = threading.BoundedSemaphore(_cfg("HASH_QUEUE_LIMIT", 8))
+            _pool_pid = os.getpid()
+        return _pool, _slots
+
+
+def _run(fn, *args):
+    pool, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise HashPoolBusy()
+
+    if pool is None:
+        try:
+            return fn(*args)
+        finally:
+            slots.release()
+
+    try:
+        future = pool.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    # Hold the slot until the job really finishes: a job we stop waiting
+    # for keeps its worker (or queue place) busy, so it must keep counting.
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=_cfg("HASH_TIMEOUT", 5))
+    except FutureTimeout:
+        future.cancel()  # only succeeds if it hasn't been picked up yet
+        raise HashPoolBusy()
+
+
+def _prefix(pw_hash: str) -> str:
+    return pw_hash.split("$", 1)[0]
+
+
+# ────────────────────────────────────────────────────────────────
+def hash_password(plain: str) -> str:
+    """Hash ``plain`` with PASSWORD_HASH_METHOD in the pool."""
+    return _run(generate_password_hash, plain, _cfg("PASSWORD_HASH_METHOD", "scrypt"))
+
+
+def verify_password(pw_hash: str, plain: str) -> bool:
+    """Check ``plain`` against ``pw_hash`` in the pool."""
+    return _run(check_password_hash, pw_hash, plain)
+
+
+def needs_rehash(pw_hash: str) -> bool:
+    """True if ``pw_hash`` wasn't made with the configured method/cost."""
+    method = _cfg("PASSWORD_HASH_METHOD", "scrypt")
+    if method not in _method_prefix:
+        # werkzeug fills in default cost parameters, so learn the full
+        # prefix (e.g. "scrypt:32768:8:1") from one real hash.
+        _method_prefix[method] = _prefix(_run(generate_password_hash, "", method))
+    return _prefix(pw_hash) != _method_prefix[method]
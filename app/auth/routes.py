@@ -4,16 +4,38 @@
 
 from flask import (
     Blueprint, render_template, request,
-    redirect, url_for, flash
+    redirect, url_for, flash, current_app
 )
 from flask_login import (
     login_user, logout_user,
     login_required, current_user
 )
 from app.models import db, User
+from app.auth.hashing import HashPoolBusy, hash_password, needs_rehash
+from app.auth.throttle import Throttle
 
 bp = Blueprint("auth", __name__, url_prefix="/auth")
 
+
+def _throttles():
+    """Per-app (ip, username) throttles, built from config on first use."""
+    ext = current_app.extensions
+    if "auth_throttles" not in ext:
+        cfg = current_app.config
+        ext["auth_throttles"] = (
+            Throttle(cfg.get("LOGIN_IP_LIMIT", 20), cfg.get("LOGIN_IP_WINDOW", 60),
+                     cfg.get("THROTTLE_MAX_KEYS", 10000)),
+            Throttle(cfg.get("LOGIN_USER_LIMIT", 5), cfg.get("LOGIN_USER_WINDOW", 300),
+                     cfg.get("THROTTLE_MAX_KEYS", 10000)),
+        )
+    return ext["auth_throttles"]
+
+
+def _client_ip():
+    """Client address as reported by the front-end proxy (CLIENT_IP_HEADER)."""
+    header = current_app.config.get("CLIENT_IP_HEADER")
+    return (header and request.headers.get(header)) or request.remote_addr
+
 # ────────────────────────────────────────────────────────────────
 @bp.route("/register", methods=["GET", "POST"])
 def register():
@@ -25,6 +47,11 @@ def register():
         email = request.form["email"].lower()
         pw    = request.form["password"]
 
+        ip_throttle, _ = _throttles()
+        if not ip_throttle.allow(_client_ip()):
+            flash("Too many attempts — try again in a minute")
+            return render_template("register.html"), 429
+
         # Duplicate check
         if User.query.filter(
             (User.username == uname) | (User.email == email)
@@ -34,7 +61,11 @@ def register():
 
         # Create user
         u = User(username=uname, email=email)
-        u.set_password(pw)
+        try:
+            u.set_password(pw)
+        except HashPoolBusy:
+            flash("Server busy — please try again")
+            return render_template("register.html"), 503
         db.session.add(u)
         db.session.commit()
 
@@ -54,11 +85,34 @@ def login():
         uname = request.form["username"].lower()
         pw    = request.form["password"]
 
+        # Throttle before touching the hashing pool
+        ip_throttle, user_throttle = _throttles()
+        if not ip_throttle.allow(_client_ip()) or user_throttle.blocked(uname):
+            flash("Too many attempts — try again in a few minutes")
+            return render_template("login.html"), 429
+
         u = User.query.filter_by(username=uname).first()
-        if u and u.check_password(pw):
+        try:
+            ok = bool(u) and u.check_password(pw)
+        except HashPoolBusy:
+            flash("Server busy — please try again")
+            return render_template("login.html"), 503
+
+        if ok:
+            user_throttle.reset(uname)
+            # Upgrade hashes made with an older method/cost
+            try:
+                if needs_rehash(u.pw_hash):
+                    u.pw_hash = hash_password(pw)
+                    db.session.commit()
+            except HashPoolBusy:
+                pass  # try again on a later login
             login_user(u)
             return redirect(url_for("main.home"))
 
+        # Count every failure, known account or not, so a 429 doesn't reveal
+        # which usernames exist (memory is bounded by the throttle's sweep)
+        user_throttle.allow(uname)
         flash("Invalid username or password")
 
     return render_template("login.html")
@@ -0,0 +1,65 @@
+# app/auth/throttle.py
+# --------------------
+# Sliding-window attempt counters for the auth routes.
+#
+# State lives in process memory, so limits apply per worker.  That is
+# enough to keep a single client from monopolising the hashing pool.
+# Once more than ``max_keys`` keys are tracked, keys with no hits inside
+# the window are swept so spraying unique keys can't grow it forever.
+
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class Throttle:
+    """Allow at most ``limit`` hits per ``window`` seconds for each key."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._sweep_at = max_keys
+        self._hits = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def _trim(self, q, now):
+        while q and q[0] <= now - self.window:
+            q.popleft()
+
+    def _sweep(self, now):
+        stale = [k for k, q in self._hits.items() if not q or q[-1] <= now - self.window]
+        for k in stale:
+            del self._hits[k]
+        # If most keys are still live, back off so sweeps stay amortised O(1)
+        self._sweep_at = max(self.max_keys, 2 * len(self._hits))
+
+    def allow(self, key) -> bool:
+        """Record a hit for ``key``; False if it is over the limit."""
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._hits and len(self._hits) >= self._sweep_at:
+                self._sweep(now)
+            q = self._hits[key]
+            self._trim(q, now)
+            if len(q) >= self.limit:
+                return False
+            q.append(now)
+            return True
+
+    def blocked(self, key) -> bool:
+        """True if ``key`` is over the limit, without recording a hit."""
+        now = time.monotonic()
+        with self._lock:
+            q = self._hits.get(key)
+            if not q:
+                return False
+            self._trim(q, now)
+            if not q:
+                del self._hits[key]
+                return False
+            return len(q) >= self.limit
+
+    def reset(self, key) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
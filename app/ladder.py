@@ -0,0 +1,266 @@
+"""
+app/ladder.py
+-------------
+Cumulative all-time and rolling weekly ladders.
+
+Each ladder keeps per-user (total score, total time) in a dict and the
+ordering key ``(-score, time, user_id)`` in a ``SortedList``, so top-N
+and rank lookups are O(log n) and an update is a remove + insert.
+
+The ladders follow ``score_log`` by primary key: ``sync()`` applies only
+rows with ``id > last_id``, so every worker process stays current with
+one cheap range query even when the submission was handled elsewhere.
+All-time totals are snapshotted to ``LADDER_SNAPSHOT_PATH``; on startup
+the snapshot is loaded and caught up, or, if missing or stale, the
+ladder is rebuilt from ``score_log`` plus the archived ``UserScoreStat``
+totals.  The snapshot records those archived totals too: rows archived
+after it was taken may never reach sync(), so any change forces a
+rebuild.  The weekly ladder is always rebuilt from the last N days.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sortedcontainers import SortedList
+from sqlalchemy import func
+
+from app import db
+from app.models import ScoreLog, UserScoreStat
+
+
+class Ladder:
+    """Order-statistic view of per-user (score, time) totals."""
+
+    def __init__(self):
+        self._totals = {}
+        self._order = SortedList()
+
+    def __len__(self):
+        return len(self._order)
+
+    @staticmethod
+    def _key(user_id, score, time_taken):
+        return (-score, time_taken, user_id)
+
+    def add(self, user_id: int, score: float, time_taken: int) -> None:
+        """Add (or with negative values, subtract) to a user's totals."""
+        old = self._totals.get(user_id)
+        if old is not None:
+            self._order.remove(self._key(user_id, *old))
+            score += old[0]
+            time_taken += old[1]
+        self._totals[user_id] = (score, time_taken)
+        self._order.add(self._key(user_id, score, time_taken))
+
+    def discard(self, user_id: int) -> None:
+        old = self._totals.pop(user_id, None)
+        if old is not None:
+            self._order.remove(self._key(user_id, *old))
+
+    def top(self, n: int):
+        """[(user_id, score, time_taken), ...] for the best ``n`` users."""
+        return [(uid, -neg, t) for neg, t, uid in self._order.islice(0, n)]
+
+    def rank(self, user_id: int):
+        """1-based rank of ``user_id`` or None if they're not on the ladder."""
+        totals = self._totals.get(user_id)
+        if totals is None:
+            return None
+        return self._order.index(self._key(user_id, *totals)) + 1
+
+    def totals(self, user_id: int):
+        return self._totals.get(user_id)
+
+    def as_dict(self) -> dict:
+        return {str(uid): list(v) for uid, v in self._totals.items()}
+
+
+class Ladders:
+    """All-time + weekly ladders kept in step with ``score_log``."""
+
+    def __init__(self, snapshot_path: str, week_days: int = 7, snapshot_every: int = 50):
+        self.snapshot_path = snapshot_path
+        self.week = timedelta(days=week_days)
+        self.snapshot_every = snapshot_every
+
+        self.alltime = Ladder()
+        self.weekly = Ladder()
+        self._week_rows = deque()  # (timestamp, user_id, score, time) in id order
+        self._week_counts = Counter()
+        self.last_id = 0
+        self.archived = [0, 0.0]  # UserScoreStat (submissions, score) the ladder reflects
+        self._unsaved = 0
+        self._lock = threading.RLock()
+
+    # ── building ────────────────────────────────────────────────
+    @staticmethod
+    def _archived_totals():
+        submissions, score = db.session.query(
+            func.coalesce(func.sum(UserScoreStat.submissions), 0),
+            func.coalesce(func.sum(UserScoreStat.total_score), 0.0),
+        ).one()
+        return [int(submissions), float(score)]
+
+    def _load_snapshot(self, max_id: int) -> bool:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snap = json.load(f)
+        except (OSError, ValueError):
+            return False
+        # A snapshot ahead of the table means the DB was reset
+        if snap.get("last_id", 0) > max_id:
+            return False
+        # Rows archived since the snapshot may be missing from it
+        if snap.get("archived") != self.archived:
+            return False
+        for uid, (score, time_taken) in snap["alltime"].items():
+            self.alltime.add(int(uid), score, time_taken)
+        self.last_id = snap["last_id"]
+        return True
+
+    def _rebuild_alltime(self, max_id: int) -> None:
+        for uid, score, time_taken in db.session.query(
+            UserScoreStat.user_id, UserScoreStat.total_score, UserScoreStat.total_time
+        ):
+            self.alltime.add(uid, score or 0.0, time_taken or 0)
+
+        live = (
+            db.session.query(
+                ScoreLog.user_id,
+                func.sum(ScoreLog.score),
+                func.sum(func.coalesce(ScoreLog.time_taken, 0)),
+            )
+            .filter(ScoreLog.user_id.isnot(None), ScoreLog.id <= max_id)
+            .group_by(ScoreLog.user_id)
+        )
+        for uid, score, time_taken in live:
+            self.alltime.add(uid, float(score or 0), int(time_taken or 0))
+        self.last_id = max_id
+
+    def rebuild(self) -> None:
+        """Load the snapshot (or rebuild all-time) and rebuild weekly."""
+        with self._lock:
+            self.alltime, self.weekly = Ladder(), Ladder()
+            self._week_rows.clear()
+            self._week_counts.clear()
+
+            self.archived = self._archived_totals()
+            max_id = db.session.query(func.max(ScoreLog.id)).scalar() or 0
+            if not self._load_snapshot(max_id):
+                self._rebuild_alltime(max_id)
+
+            cutoff = datetime.utcnow() - self.week
+            rows = (
+                db.session.query(ScoreLog.timestamp, ScoreLog.user_id,
+                                 ScoreLog.score, ScoreLog.time_taken)
+                .filter(ScoreLog.user_id.isnot(None),
+                        ScoreLog.timestamp >= cutoff,
+                        ScoreLog.id <= self.last_id)
+                .order_by(ScoreLog.id)
+            )
+            for row in rows:
+                self._add_weekly(row.timestamp, row.user_id, row.score or 0.0, row.time_taken or 0)
+
+        self.sync()
+
+    # ── incremental updates ─────────────────────────────────────
+    def _add_weekly(self, ts, user_id, score, time_taken):
+        self._week_rows.append((ts, user_id, score, time_taken))
+        self._week_counts[user_id] += 1
+        self.weekly.add(user_id, score, time_taken)
+
+    def _expire_weekly(self) -> None:
+        cutoff = datetime.utcnow() - self.week
+        while self._week_rows and self._week_rows[0][0] < cutoff:
+            _, uid, score, time_taken = self._week_rows.popleft()
+            self._week_counts[uid] -= 1
+            if self._week_counts[uid]:
+                self.weekly.add(uid, -score, -time_taken)
+            else:
+                del self._week_counts[uid]
+                self.weekly.discard(uid)
+
+    def sync(self) -> int:
+        """Apply ``score_log`` rows newer than ``last_id``; return how many."""
+        with self._lock:
+            rows = (
+                db.session.query(ScoreLog.id, ScoreLog.timestamp, ScoreLog.user_id,
+                                 ScoreLog.score, ScoreLog.time_taken)
+                .filter(ScoreLog.id > self.last_id)
+                .order_by(ScoreLog.id)
+                .all()
+            )
+            for row in rows:
+                self.last_id = row.id
+                if row.user_id is None:
+                    continue
+                score, time_taken = row.score or 0.0, row.time_taken or 0
+                self.alltime.add(row.user_id, score, time_taken)
+                self._add_weekly(row.timestamp, row.user_id, score, time_taken)
+            self._expire_weekly()
+
+            self._unsaved += len(rows)
+            if self._unsaved >= self.snapshot_every:
+                self.save_snapshot()
+            return len(rows)
+
+    def save_snapshot(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "last_id": self.last_id,
+                    "archived": self.archived,
+                    "alltime": self.alltime.as_dict(),
+                }, f)
+            os.replace(tmp, self.snapshot_path)
+            self._unsaved = 0
+
+    def get(self, period: str) -> Ladder:
+        """The underlying ladder; callers must hold ``_lock`` while reading it."""
+        return self.weekly if period == "weekly" else self.alltime
+
+    def standings(self, period: str, limit: int, user_id: int = None):
+        """Sync, then return (players, top, me) as plain data.
+
+        ``top`` is ``[(user_id, score, time_taken), ...]`` and ``me`` is
+        ``(rank, score, time_taken)`` or None.  Reads happen under the lock
+        so a concurrent sync() can't swap keys out mid-lookup.
+        """
+        with self._lock:
+            self.sync()
+            board = self.get(period)
+            me = None
+            if user_id is not None:
+                rank = board.rank(user_id)
+                if rank is not None:
+                    me = (rank, *board.totals(user_id))
+            return len(board), board.top(limit), me
+
+
+# ────────────────────────────────────────────────────────────────
+_init_lock = threading.Lock()
+
+
+def get_ladders() -> Ladders:
+    """Process-wide ladders for the current app, built on first use."""
+    ext = current_app.extensions
+    if "ladders" not in ext:
+        with _init_lock:
+            if "ladders" not in ext:
+                cfg = current_app.config
+                ladders = Ladders(
+                    cfg["LADDER_SNAPSHOT_PATH"],
+                    week_days=cfg.get("LADDER_WEEK_DAYS", 7),
+                    snapshot_every=cfg.get("LADDER_SNAPSHOT_EVERY", 50),
+                )
+                ladders.rebuild()
+                atexit.register(ladders.save_snapshot)
+                ext["ladders"] = ladders
+    return ext["ladders"]
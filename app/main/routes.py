@@ -1,16 +1,18 @@
-import os, json, random
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, make_response
+import os, random, sqlite3
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, make_response, current_app, g
 from flask_login import current_user, login_required
 from datetime import datetime, timedelta
-from app.models import db, GuessLog, ScoreLog
-from sqlalchemy import func
+from app.models import db, GuessLog, ScoreLog, PlayerGuessStat, QuizScoreStat
+from sqlalchemy import func, case, or_, and_
 from urllib.parse import unquote
+import player_db
+from app.ladder import get_ladders
+from app.quizzes import CURRENT_DIR, find_quiz, load_quiz, current_quiz_id, list_past, rotated_recently
 
 bp = Blueprint("main", __name__)
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 QUIZ_DIR     = os.path.join(PROJECT_ROOT, "app", "static", "preloaded_quizzes")
-CURRENT_DIR  = os.path.join(PROJECT_ROOT, "app", "static", "current_quiz")
 CBB_CSV      = os.path.join(PROJECT_ROOT, "app", "static", "json", "cbb25.csv")
 
 
@@ -96,6 +98,175 @@ def get_leaderboard(quiz_id, limit=10):
         for r in q
     ]
 
+def get_player_conn():
+    """Read-only player DB connection for this request, or None if not built."""
+    if "player_conn" not in g:
+        try:
+            g.player_conn = player_db.connect(current_app.config["PLAYER_DB_PATH"], readonly=True)
+        except sqlite3.OperationalError:
+            g.player_conn = None
+    return g.player_conn
+
+
+@bp.teardown_app_request
+def close_player_conn(exc):
+    conn = g.pop("player_conn", None)
+    if conn is not None:
+        conn.close()
+
+def get_percentile(quiz_id, score):
+    """Percent of submissions for a quiz scoring at or below ``score``.
+
+    Counts live ``score_log`` rows plus the archived histogram.
+    """
+    live_total, live_rank = (
+        db.session.query(
+            func.count(ScoreLog.id),
+            func.coalesce(func.sum(case((ScoreLog.score <= score, 1), else_=0)), 0),
+        )
+        .filter(ScoreLog.quiz_id == quiz_id)
+        .one()
+    )
+    arch_total, arch_rank = (
+        db.session.query(
+            func.coalesce(func.sum(QuizScoreStat.count), 0),
+            func.coalesce(func.sum(case((QuizScoreStat.score <= score, QuizScoreStat.count), else_=0)), 0),
+        )
+        .filter(QuizScoreStat.quiz_id == quiz_id)
+        .one()
+    )
+    total = live_total + arch_total
+    if not total:
+        return 0
+    return round(100 * (live_rank + arch_rank) / total)
+
+
+def get_streak(user_id):
+    """Consecutive days (ending at the latest score) with a submission."""
+    return ScoreLog.latest_run(user_id)[0]
+
+
+def grade_quiz(data, form):
+    """Grade submitted guesses against the quiz's answer key.
+
+    Returns (score, max_points, rows) where each row holds the per-player
+    result mark, reveal text, share status and what to log.
+    """
+    rows = []
+    score, max_points = 0.0, 0.0
+
+    for idx, p in enumerate(data["players"]):
+        name         = p["name"]
+        school_type  = p["school_type"]
+        team_name    = p["school"]
+        country      = p["country"]
+        guess        = form.get(name, "").strip()
+        used_hint    = form.get(f"hint_used_{idx}", "0") == "1"
+
+        is_correct = False
+        pts = 0.0
+
+        if school_type == "College":
+            max_points += 1.0
+            if guess.lower() == team_name.lower():
+                pts = 0.75 if used_hint else 1.0
+                is_correct = True
+            answer = f"I played for {team_name}"
+
+        else:
+            max_points += 1.0
+            if guess.lower() == team_name.lower():
+                pts = 1.0
+                is_correct = True
+            elif guess.lower() == country.lower():
+                pts = 0.75
+                is_correct = True
+            answer = f"I am from {country} and played for {team_name}"
+
+        score += pts
+        rows.append({
+            "name": name,
+            "school": team_name,
+            "guess": guess,
+            "is_correct": is_correct,
+            "used_hint": used_hint,
+            "result": "✅" if is_correct else "❌",
+            "answer": answer,
+            "share": "🟨 -- Used Hint" if (is_correct and used_hint) else ("✅ -- Correct" if is_correct else "❌ -- Missed"),
+        })
+
+    return score, max_points, rows
+
+
+def share_text(data, score, max_points, rows, perf_text):
+    date_str = datetime.utcnow().strftime("%B %-d, %Y")
+    share_lines = [
+        f"\U0001F3C0 Starting5 Puzzle – {date_str}",
+        f"\U0001F4C8 Score: {round(score,2)}/{round(max_points,2)}",
+        "",
+    ]
+    for pl, row in zip(data["players"], rows):
+        share_lines.append(f"🔹 {pl['position']}: {row['share']}")
+    share_lines += ["", perf_text, "Play now: www.starting5.us"]
+    return "\n".join(share_lines)
+
+
+def render_results(data, quiz_id, score, max_points, rows, conf_map, colleges,
+                   streak=0, form_action=None, notice=None):
+    percentile = get_percentile(quiz_id, score)
+    leaderboard = get_leaderboard(quiz_id)
+    show_leaderboard = bool(leaderboard) or not current_user.is_authenticated
+    perf_text = performance_text(score, max_points)
+
+    return render_template(
+        "quiz.html",
+        data            = data,
+        colleges        = colleges,
+        college_confs   = conf_map,
+        results         = [r["result"] for r in rows],
+        correct_answers = [r["answer"] for r in rows],
+        score           = round(score, 2),
+        max_points      = round(max_points, 2),
+        quiz_id         = quiz_id,
+        form_action     = form_action,
+        notice          = notice,
+        percentile      = percentile,
+        streak          = streak,
+        share_message   = share_text(data, score, max_points, rows, perf_text),
+        performance_text= perf_text,
+        leaderboard     = leaderboard,
+        show_leaderboard= show_leaderboard,
+    )
+
+
+def render_blank(data, quiz_id, conf_map, colleges, form_action=None):
+    streak = get_streak(current_user.id) if current_user.is_authenticated else 0
+    return render_template(
+        "quiz.html",
+        data            = data,
+        colleges        = colleges,
+        college_confs   = conf_map,
+        results         = None,
+        correct_answers = [],
+        score           = None,
+        max_points      = None,
+        quiz_id         = quiz_id,
+        form_action     = form_action,
+        streak          = streak,
+        share_message   = None,
+        performance_text = None,
+        leaderboard     = get_leaderboard(quiz_id),
+        show_leaderboard= False,
+    )
+
+
+def load_normalised(path, conf_map):
+    data = load_quiz(path)
+    for pl in data["players"]:
+        normalise_usc(pl, conf_map)
+    return data
+
+
 @bp.route("/")
 def home():
     return redirect(url_for("main.show_quiz"))
@@ -106,17 +277,25 @@ def show_quiz():
     conf_map, colleges = load_confs()
 
     if request.method == "POST":
-        # (Unchanged) read quiz_json_path from the form and grade it
-        qp = request.form.get("quiz_json_path", "")
-        if not qp or not os.path.isfile(qp):
+        # Only the live quiz is logged here. Past quizzes are replayed
+        # (unlogged) via the archive so they can't be farmed for ladder points,
+        # except one rotated out moments ago while the player was answering.
+        quiz_key = request.form.get("quiz_id")
+        if quiz_key:
+            qp, is_current = find_quiz(quiz_key)
+            if qp and not is_current:
+                if rotated_recently(qp, current_app.config.get("QUIZ_ROTATION_GRACE", 900)):
+                    is_current = True
+                else:
+                    return redirect(url_for("main.archived_quiz", quiz_id=quiz_key, late=1), code=307)
+        else:
+            # Accept quiz_json_path from pages rendered before quiz_id existed
+            quiz_key = os.path.basename(request.form.get("quiz_json_path", ""))
+            qp, is_current = find_quiz(quiz_key)
+        if not qp or not is_current:
             return redirect(url_for("main.show_quiz"))
 
-        with open(qp, encoding="utf-8") as f:
-            data = json.load(f)
-        for pl in data["players"]:
-            normalise_usc(pl, conf_map)
-
-        quiz_key = os.path.basename(qp)
+        data = load_normalised(qp, conf_map)
         time_taken = request.form.get("time_taken", type=int)
 
         existing_score = None
@@ -131,54 +310,19 @@ def show_quiz():
                 .first()
             )
 
-        results, correct_answers, share_statuses = [], [], []
-        score, max_points = 0.0, 0.0
-
-        for idx, p in enumerate(data["players"]):
-            name         = p["name"]
-            school_type  = p["school_type"]
-            team_name    = p["school"]
-            country      = p["country"]
-            guess        = request.form.get(name, "").strip()
-            used_hint    = request.form.get(f"hint_used_{idx}", "0") == "1"
-
-            is_correct = False
-            pts = 0.0
-
-            if school_type == "College":
-                max_points += 1.0
-                if guess.lower() == team_name.lower():
-                    pts = 0.75 if used_hint else 1.0
-                    is_correct = True
-                score += pts
-                results.append("✅" if is_correct else "❌")
-                share_statuses.append("🟨 -- Used Hint" if (is_correct and used_hint) else ("✅ -- Correct" if is_correct else "❌ -- Missed"))
-                correct_answers.append(f"I played for {team_name}")
-
-            else:
-                max_points += 1.0
-                if guess.lower() == team_name.lower():
-                    pts = 1.0
-                    is_correct = True
-                elif guess.lower() == country.lower():
-                    pts = 0.75
-                    is_correct = True
-                score += pts
-                results.append("✅" if is_correct else "❌")
-                share_statuses.append("🟨 -- Used Hint" if (is_correct and used_hint) else ("✅ -- Correct" if is_correct else "❌ -- Missed"))
-                correct_answers.append(f"I am from {country} and played for {team_name}")
-
-             # Log the guess only for authenticated users
-            if current_user.is_authenticated and not existing_score:
-                guess_log = GuessLog(
+        score, max_points, rows = grade_quiz(data, request.form)
+
+        # Log the guesses only for authenticated users
+        if current_user.is_authenticated and not existing_score:
+            for r in rows:
+                db.session.add(GuessLog(
                     user_id=current_user.id,
-                    player_name=name,
-                    school=team_name,
-                    guess=guess,
-                    is_correct=is_correct,
-                    used_hint=used_hint
-                )
-                db.session.add(guess_log)
+                    player_name=r["name"],
+                    school=r["school"],
+                    guess=r["guess"],
+                    is_correct=r["is_correct"],
+                    used_hint=r["used_hint"],
+                ))
 
         if not existing_score:
             score_entry = ScoreLog(
@@ -190,134 +334,109 @@ def show_quiz():
             )
             db.session.add(score_entry)
             db.session.commit()
+            get_ladders().sync()
         else:
             score = existing_score.score
             max_points = existing_score.max_points
             time_taken = existing_score.time_taken
-        
-        streak = 0
-        if current_user.is_authenticated:
-            logs = (
-                ScoreLog.query.filter_by(user_id=current_user.id)
-                .order_by(ScoreLog.timestamp.desc())
-                .all()
-            )
-            if logs:
-                streak = 1
-                prev = logs[0].timestamp.date()
-                for log in logs[1:]:
-                    d = log.timestamp.date()
-                    if d == prev:
-                        continue
-                    if (prev - d).days == 1:
-                        streak += 1
-                        prev = d
-                    else:
-                        break
-
-        scores = [s.score for s in ScoreLog.query.filter_by(quiz_id=quiz_key).all()]
-        percentile = 0
-        if scores:
-            scores.sort()
-            rank = sum(s <= score for s in scores)
-            percentile = round(100 * rank / len(scores))
-
-        leaderboard = get_leaderboard(quiz_key)
-        show_leaderboard = bool(leaderboard) or not current_user.is_authenticated
-        
-        perf_text = performance_text(score, max_points)
-
-        date_str = datetime.utcnow().strftime("%B %-d, %Y")
-        share_lines = [
-            f"\U0001F3C0 Starting5 Puzzle – {date_str}",
-            f"\U0001F4C8 Score: {round(score,2)}/{round(max_points,2)}",
-            "",
-        ]
-        for pl, status in zip(data["players"], share_statuses):
-            share_lines.append(f"\uD83D\uDD39 {pl['position']}: {status}")
-        share_lines += ["", perf_text, "Play now: www.starting5.us"]
-        share_message = "\n".join(share_lines)
-
-        return render_template(
-            "quiz.html",
-            data            = data,
-            colleges        = colleges,
-            college_confs   = conf_map,
-            results         = results,
-            correct_answers = correct_answers,
-            score           = round(score, 2),
-            max_points      = round(max_points, 2),
-            quiz_json_path  = qp,
-            quiz_id        = os.path.basename(qp),
-            percentile     = percentile,
-            streak          = streak,
-            share_message   = share_message,
-            performance_text= perf_text,
-            leaderboard     = leaderboard,
-            show_leaderboard= show_leaderboard,
-        )
+
+        streak = get_streak(current_user.id) if current_user.is_authenticated else 0
+        return render_results(data, quiz_key, score, max_points, rows, conf_map, colleges, streak=streak)
 
     # ─────────────────────────────────────────────────────────────────────────────
     # GET: serve whatever JSON is in CURRENT_DIR (there should be exactly one file)
     # ─────────────────────────────────────────────────────────────────────────────
-    # Ensure current_quiz folder exists (if not, create it)
-    os.makedirs(CURRENT_DIR, exist_ok=True)
-
-    # Look for any .json in CURRENT_DIR
-    current_files = [f for f in os.listdir(CURRENT_DIR) if f.lower().endswith(".json")]
-    if not current_files:
+    quiz_id = current_quiz_id()
+    if not quiz_id:
         return "❌ No current quiz loaded. Please run the updater script.", 500
 
-    # We assume only ONE file should be there at a time
-    quiz_filename = current_files[0]
-    quiz_path = os.path.join(CURRENT_DIR, quiz_filename)
+    data = load_normalised(os.path.join(CURRENT_DIR, quiz_id), conf_map)
+    return render_blank(data, quiz_id, conf_map, colleges)
 
-    with open(quiz_path, encoding="utf-8") as f:
-        data = json.load(f)
-    for pl in data["players"]:
-        normalise_usc(pl, conf_map)
 
-    streak = 0
-    if current_user.is_authenticated:
-        logs = (
-            ScoreLog.query.filter_by(user_id=current_user.id)
-            .order_by(ScoreLog.timestamp.desc())
-            .all()
-        )
-        if logs:
-            streak = 1
-            prev = logs[0].timestamp.date()
-            for log in logs[1:]:
-                d = log.timestamp.date()
-                if d == prev:
-                    continue
-                if (prev - d).days == 1:
-                    streak += 1
-                    prev = d
-                else:
-                    break
+# ─────────────────────────────────────────────────────────────────────────────
+# Archive & history
+# ─────────────────────────────────────────────────────────────────────────────
+def _page_limit():
+    return max(1, min(request.args.get("limit", 20, type=int), 100))
 
-    leaderboard = get_leaderboard(os.path.basename(quiz_path))
-    show_leaderboard = False
-    
-    return render_template(
-        "quiz.html",
-        data            = data,
-        colleges        = colleges,
-        college_confs   = conf_map,
-        results         = None,
-        correct_answers = [],
-        score           = None,
-        max_points      = None,
-        quiz_json_path  = quiz_path,
-        quiz_id        = os.path.basename(quiz_path),
-        streak         = streak,
-        share_message  = None,
-        performance_text = None,
-        leaderboard = leaderboard,
-        show_leaderboard= show_leaderboard,
 
-    )
+@bp.route("/archive")
+def archive():
+    """Past quizzes, newest first: ?cursor=<next_cursor>&limit=N."""
+    try:
+        items, next_cursor = list_past(request.args.get("cursor"), _page_limit())
+    except ValueError:
+        return jsonify({"error": "bad cursor"}), 400
+    return jsonify({"quizzes": items, "next_cursor": next_cursor})
+
+
+@bp.route("/archive/<quiz_id>", methods=["GET", "POST"])
+def archived_quiz(quiz_id):
+    """Replay a past quiz. Graded like the live one but not logged."""
+    qp, is_current = find_quiz(quiz_id)
+    if is_current:
+        return redirect(url_for("main.show_quiz"))
+    if not qp:
+        return jsonify({"error": "unknown quiz"}), 404
+
+    conf_map, colleges = load_confs()
+    data = load_normalised(qp, conf_map)
+    action = url_for("main.archived_quiz", quiz_id=quiz_id)
+
+    if request.method == "POST":
+        score, max_points, rows = grade_quiz(data, request.form)
+        notice = None
+        if request.args.get("late"):
+            notice = "This quiz was rotated out before you submitted, so this score wasn't recorded."
+        return render_results(data, quiz_id, score, max_points, rows, conf_map, colleges,
+                              form_action=action, notice=notice)
+    return render_blank(data, quiz_id, conf_map, colleges, form_action=action)
+
+
+@bp.route("/history")
+@login_required
+def history():
+    """The current user's scores, newest first: ?cursor=<next_cursor>&limit=N.
+
+    Keyset-paginated on (timestamp, id) so every page is one index range
+    scan on ix_score_log_user_ts, however deep the cursor.
+    """
+    limit = _page_limit()
+    q = ScoreLog.query.filter(ScoreLog.user_id == current_user.id)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            ts_str, _, id_str = cursor.rpartition("_")
+            ts, last_id = datetime.fromisoformat(ts_str), int(id_str)
+        except ValueError:
+            return jsonify({"error": "bad cursor"}), 400
+        q = q.filter(or_(
+            ScoreLog.timestamp < ts,
+            and_(ScoreLog.timestamp == ts, ScoreLog.id < last_id),
+        ))
+
+    rows = q.order_by(ScoreLog.timestamp.desc(), ScoreLog.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = f"{last.timestamp.isoformat()}_{last.id}"
+
+    return jsonify({
+        "scores": [
+            {
+                "quiz_id": s.quiz_id,
+                "score": round(s.score, 2) if s.score is not None else None,
+                "max_points": round(s.max_points, 2) if s.max_points is not None else None,
+                "time_taken": s.time_taken,
+                "timestamp": s.timestamp.isoformat(),
+            }
+            for s in page
+        ],
+        "next_cursor": next_cursor,
+    })
 
 
 @bp.route("/player_accuracy/<player_name>")
@@ -327,6 +446,11 @@ def player_accuracy(player_name):
     total = db.session.query(func.count(GuessLog.id)).filter_by(player_name=safe_name).scalar()
     correct = db.session.query(func.count(GuessLog.id)).filter_by(player_name=safe_name, is_correct=True).scalar()
 
+    archived = db.session.get(PlayerGuessStat, safe_name)
+    if archived:
+        total += archived.total
+        correct += archived.correct
+
     percent = round(100 * correct / total, 1) if total else 0
 
     response = make_response(jsonify({"player": safe_name, "accuracy": percent}))
@@ -335,3 +459,50 @@ def player_accuracy(player_name):
     response.headers["Expires"] = "0"
 
     return response
+
+
+@bp.route("/player_info/<int:player_id>")
+def player_info(player_id):
+    # Keyed by player_id: full names aren't unique across nba_api players
+    conn = get_player_conn()
+    info = player_db.lookup_ids(conn, [player_id]).get(player_id) if conn else None
+    if info is None:
+        return jsonify({"player_id": player_id, "error": "unknown player"}), 404
+
+    response = make_response(jsonify(info))
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    return response
+
+
+@bp.route("/ladder")
+def ladder():
+    """Cumulative ladder: ?period=alltime|weekly&limit=N (max 100)."""
+    from app.models import User  # local import to avoid circular deps
+
+    period = request.args.get("period", "alltime")
+    if period not in ("alltime", "weekly"):
+        return jsonify({"error": "period must be 'alltime' or 'weekly'"}), 400
+    limit = max(1, min(request.args.get("limit", 10, type=int), 100))
+
+    user_id = current_user.id if current_user.is_authenticated else None
+    players, top, me = get_ladders().standings(period, limit, user_id)
+
+    names = dict(
+        db.session.query(User.id, User.username).filter(User.id.in_([uid for uid, _, _ in top]))
+    )
+    payload = {
+        "period": period,
+        "players": players,
+        "top": [
+            {"rank": i, "username": names.get(uid), "score": round(score, 2), "time_taken": t}
+            for i, (uid, score, t) in enumerate(top, start=1)
+        ],
+        "me": None,
+    }
+    if me is not None:
+        rank, score, t = me
+        payload["me"] = {"rank": rank, "of": players, "score": round(score, 2), "time_taken": t}
+
+    response = make_response(jsonify(payload))
+    response.headers["Cache-Control"] = "no-cache"
+    return response
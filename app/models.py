@@ -1,6 +1,6 @@
 from app import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.auth.hashing import hash_password, verify_password
 from datetime import date, datetime
 
 class User(UserMixin, db.Model):
@@ -12,11 +12,12 @@ class User(UserMixin, db.Model):
     pw_hash   = db.Column(db.String(256), nullable=False)
     joined_on = db.Column(db.Date, default=date.today)
 
+    # Both may raise HashPoolBusy when the hashing pool is saturated.
     def set_password(self, plain):
-        self.pw_hash = generate_password_hash(plain)
+        self.pw_hash = hash_password(plain)
 
     def check_password(self, plain) -> bool:
-        return check_password_hash(self.pw_hash, plain)
+        return verify_password(self.pw_hash, plain)
 
 
 class GuessLog(db.Model):
@@ -35,6 +36,12 @@ class GuessLog(db.Model):
 
 class ScoreLog(db.Model):
     __tablename__ = "score_log"
+    __table_args__ = (
+        # Keyset pagination of a user's history / streaks
+        db.Index("ix_score_log_user_ts", "user_id", "timestamp", "id"),
+        # Per-quiz leaderboard and percentile
+        db.Index("ix_score_log_quiz_score_time", "quiz_id", "score", "time_taken"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     quiz_id = db.Column(db.String(120), index=True)
@@ -44,4 +51,65 @@ class ScoreLog(db.Model):
     time_taken = db.Column(db.Integer)  # seconds to finish
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
-    user = db.relationship('User', backref='scores')
\ No newline at end of file
+    user = db.relationship('User', backref='scores')
+
+    @classmethod
+    def latest_run(cls, user_id, batch=100):
+        """(days, first_day) of the user's most recent run of consecutive days.
+
+        Walks ``(user_id, timestamp)`` newest first in small keyset batches
+        and stops at the first gap, so only the run's own rows are read.
+        Returns (0, None) if the user has no scores.
+        """
+        streak, prev, before = 0, None, None
+        while True:
+            q = db.session.query(cls.timestamp).filter(cls.user_id == user_id)
+            if before is not None:
+                q = q.filter(cls.timestamp < before)
+            stamps = [ts for (ts,) in q.order_by(cls.timestamp.desc()).limit(batch)]
+            if not stamps:
+                return streak, prev
+
+            for ts in stamps:
+                d = ts.date()
+                if prev is None:
+                    streak, prev = 1, d
+                elif d == prev:
+                    continue
+                elif (prev - d).days == 1:
+                    streak += 1
+                    prev = d
+                else:
+                    return streak, prev
+            before = stamps[-1]
+
+class PlayerGuessStat(db.Model):
+    """Running guess counters for rows folded out of ``guess_log``."""
+    __tablename__ = "player_guess_stat"
+
+    player_name = db.Column(db.String(120), primary_key=True)
+    total       = db.Column(db.Integer, nullable=False, default=0)
+    correct     = db.Column(db.Integer, nullable=False, default=0)
+    hinted      = db.Column(db.Integer, nullable=False, default=0)
+
+
+class QuizScoreStat(db.Model):
+    """Score histogram per quiz for rows folded out of ``score_log``."""
+    __tablename__ = "quiz_score_stat"
+
+    quiz_id = db.Column(db.String(120), primary_key=True)
+    score   = db.Column(db.Float, primary_key=True)
+    count   = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserScoreStat(db.Model):
+    """Per-user score totals for rows folded out of ``score_log``.
+
+    Lets the all-time ladder be rebuilt after old rows are archived.
+    """
+    __tablename__ = "user_score_stat"
+
+    user_id     = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total_score = db.Column(db.Float, nullable=False, default=0.0)
+    total_time  = db.Column(db.Integer, nullable=False, default=0)
+    submissions = db.Column(db.Integer, nullable=False, default=0)
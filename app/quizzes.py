@@ -0,0 +1,119 @@
+"""
+app/quizzes.py
+--------------
+Quiz lookup by id and the past-quiz archive.
+
+Quizzes are addressed by file name (the ``quiz_id`` stored in
+``score_log``) and resolved only inside the current/past folders.  Parsed
+quizzes (and therefore their answer keys) are cached in memory, keyed by
+path and mtime, so grading doesn't re-read JSON on every submission.
+
+``update_quiz.py`` moves the outgoing quiz into ``past_quizzes`` and
+stamps its mtime with the rotation time; the archive is listed newest
+first with keyset pagination over (rotated_at, quiz_id).
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CURRENT_DIR  = os.path.join(PROJECT_ROOT, "app", "static", "current_quiz")
+PAST_DIR     = os.path.join(PROJECT_ROOT, "app", "static", "past_quizzes")
+
+
+def _safe_id(quiz_id: str) -> bool:
+    return bool(quiz_id) and quiz_id.endswith(".json") and os.path.basename(quiz_id) == quiz_id
+
+
+def find_quiz(quiz_id: str):
+    """Return (path, is_current) for ``quiz_id`` or (None, False)."""
+    if not _safe_id(quiz_id):
+        return None, False
+    for folder, is_current in ((CURRENT_DIR, True), (PAST_DIR, False)):
+        path = os.path.join(folder, quiz_id)
+        if os.path.isfile(path):
+            return path, is_current
+    return None, False
+
+
+@lru_cache(maxsize=256)
+def _parse(path: str, mtime: float) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_quiz(path: str) -> dict:
+    """Parsed quiz at ``path``; a private copy callers may mutate."""
+    return copy.deepcopy(_parse(path, os.path.getmtime(path)))
+
+
+def rotated_recently(path: str, seconds: float) -> bool:
+    """True if the past quiz at ``path`` was rotated out within ``seconds``."""
+    return time.time() - os.path.getmtime(path) <= seconds
+
+
+def current_quiz_id():
+    """File name of the live quiz, or None if none is loaded."""
+    os.makedirs(CURRENT_DIR, exist_ok=True)
+    files = sorted(f for f in os.listdir(CURRENT_DIR) if f.lower().endswith(".json"))
+    return files[0] if files else None
+
+
+# ────────────────────────────────────────────────────────────────
+# Past-quiz index
+# ────────────────────────────────────────────────────────────────
+_index_lock = threading.Lock()
+_index = {"mtime": None, "keys": []}  # keys sorted ascending by (-rotated_at, quiz_id)
+
+
+def _past_keys():
+    """Sorted (-rotated_at, quiz_id) keys, rebuilt only when the folder changes."""
+    os.makedirs(PAST_DIR, exist_ok=True)
+    dir_mtime = os.path.getmtime(PAST_DIR)
+    with _index_lock:
+        if _index["mtime"] != dir_mtime:
+            keys = []
+            for f in os.listdir(PAST_DIR):
+                if f.lower().endswith(".json"):
+                    keys.append((-int(os.path.getmtime(os.path.join(PAST_DIR, f))), f))
+            keys.sort()
+            _index["keys"], _index["mtime"] = keys, dir_mtime
+        return _index["keys"]
+
+
+def encode_cursor(rotated_at: int, quiz_id: str) -> str:
+    return f"{rotated_at}:{quiz_id}"
+
+
+def list_past(cursor: str = None, limit: int = 20):
+    """Return (items, next_cursor) for past quizzes, newest first."""
+    keys = _past_keys()
+    start = 0
+    if cursor:
+        ts, _, qid = cursor.partition(":")
+        start = bisect_right(keys, (-int(ts), qid))
+
+    page = keys[start:start + limit]
+    items = []
+    for neg_ts, qid in page:
+        data = load_quiz(os.path.join(PAST_DIR, qid))
+        items.append({
+            "quiz_id": qid,
+            "rotated_at": datetime.utcfromtimestamp(-neg_ts).isoformat(),
+            "season": data.get("season"),
+            "team_abbr": data.get("team_abbr"),
+            "opponent_abbr": data.get("opponent_abbr"),
+            "game_date": data.get("game_date"),
+        })
+
+    next_cursor = None
+    if start + limit < len(keys):
+        neg_ts, qid = page[-1]
+        next_cursor = encode_cursor(-neg_ts, qid)
+    return items, next_cursor
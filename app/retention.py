@@ -0,0 +1,245 @@
+"""
+app/retention.py
+----------------
+Move old ``guess_log`` / ``score_log`` rows out of the hot tables.
+
+Each archived row is first folded into an aggregate counter
+(``PlayerGuessStat`` / ``QuizScoreStat`` / ``UserScoreStat``) so
+accuracy, percentile and ladder numbers keep including it, then
+appended to a gzipped JSONL file under
+``ARCHIVE_DIR/<table>/<YYYY-MM>.jsonl.gz`` and deleted.
+
+Some expired ``score_log`` rows are kept because live queries still read
+them: every row of a user's latest run of consecutive days (so streaks
+aren't capped at the retention window) and each quiz's leaderboard rows.
+
+Work is done in id-ordered batches, each committed on its own, so a run
+can be interrupted and resumed.  Files are written before the commit:
+a crash in between may leave a duplicate line in the archive (readers
+drop repeated ids) but never double-counts an aggregate.
+"""
+
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from app.models import GuessLog, ScoreLog, PlayerGuessStat, QuizScoreStat, UserScoreStat
+
+TABLES = {
+    "guess_log": GuessLog,
+    "score_log": ScoreLog,
+}
+
+
+# ────────────────────────────────────────────────────────────────
+# Helpers
+# ────────────────────────────────────────────────────────────────
+def _row_to_dict(row) -> dict:
+    out = {}
+    for col in row.__table__.columns:
+        val = getattr(row, col.name)
+        if isinstance(val, datetime):
+            val = val.isoformat()
+        out[col.name] = val
+    return out
+
+
+def _archive_path(table: str, month: str) -> str:
+    base = current_app.config["ARCHIVE_DIR"]
+    return os.path.join(base, table, f"{month}.jsonl.gz")
+
+
+def _write_rows(table: str, rows) -> None:
+    """Append rows to their monthly archive file (one gzip member per call)."""
+    by_month = defaultdict(list)
+    for r in rows:
+        month = r.timestamp.strftime("%Y-%m") if r.timestamp else "unknown"
+        by_month[month].append(_row_to_dict(r))
+
+    for month, items in by_month.items():
+        path = _archive_path(table, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def _fold_guesses(rows) -> None:
+    counts = defaultdict(lambda: [0, 0, 0])
+    for r in rows:
+        c = counts[r.player_name]
+        c[0] += 1
+        c[1] += 1 if r.is_correct else 0
+        c[2] += 1 if r.used_hint else 0
+
+    for name, (total, correct, hinted) in counts.items():
+        stat = db.session.get(PlayerGuessStat, name)
+        if stat is None:
+            stat = PlayerGuessStat(player_name=name, total=0, correct=0, hinted=0)
+            db.session.add(stat)
+        stat.total += total
+        stat.correct += correct
+        stat.hinted += hinted
+
+
+def _fold_scores(rows) -> None:
+    counts = defaultdict(int)
+    for r in rows:
+        if r.quiz_id is None or r.score is None:
+            continue
+        counts[(r.quiz_id, r.score)] += 1
+
+    for (quiz_id, score), n in counts.items():
+        stat = db.session.get(QuizScoreStat, (quiz_id, score))
+        if stat is None:
+            stat = QuizScoreStat(quiz_id=quiz_id, score=score, count=0)
+            db.session.add(stat)
+        stat.count += n
+
+    users = defaultdict(lambda: [0.0, 0, 0])
+    for r in rows:
+        if r.user_id is None:
+            continue
+        u = users[r.user_id]
+        u[0] += r.score or 0.0
+        u[1] += r.time_taken or 0
+        u[2] += 1
+
+    for user_id, (total_score, total_time, n) in users.items():
+        stat = db.session.get(UserScoreStat, user_id)
+        if stat is None:
+            stat = UserScoreStat(user_id=user_id, total_score=0.0, total_time=0, submissions=0)
+            db.session.add(stat)
+        stat.total_score += total_score
+        stat.total_time += total_time
+        stat.submissions += n
+
+
+_FOLDERS = {
+    "guess_log": _fold_guesses,
+    "score_log": _fold_scores,
+}
+
+# Matches get_leaderboard()'s default size
+LEADERBOARD_KEEP = 10
+
+
+def _keep_scores(rows, cache) -> set:
+    """Ids of expired ``score_log`` rows that must stay in the live table."""
+    keep = set()
+    for r in rows:
+        if r.user_id is not None:
+            key = ("run", r.user_id)
+            if key not in cache:
+                cache[key] = ScoreLog.latest_run(r.user_id)[1]
+            start = cache[key]
+            if start is not None and r.timestamp and r.timestamp.date() >= start:
+                keep.add(r.id)
+
+        if r.quiz_id is not None:
+            key = ("board", r.quiz_id)
+            if key not in cache:
+                cache[key] = {
+                    i for (i,) in db.session.query(ScoreLog.id)
+                    .filter(ScoreLog.quiz_id == r.quiz_id, ScoreLog.user_id.isnot(None))
+                    .order_by(ScoreLog.score.desc(), ScoreLog.time_taken.asc())
+                    .limit(LEADERBOARD_KEEP)
+                }
+            if r.id in cache[key]:
+                keep.add(r.id)
+    return keep
+
+
+_KEEPERS = {
+    "guess_log": lambda rows, cache: set(),
+    "score_log": _keep_scores,
+}
+
+
+# ────────────────────────────────────────────────────────────────
+# Public API
+# ────────────────────────────────────────────────────────────────
+def archive_table(table: str, days: int = None, batch_size: int = None,
+                  max_batches: int = None, dry_run: bool = False) -> int:
+    """Archive rows of ``table`` older than ``days``; return rows moved.
+
+    With ``dry_run`` nothing is changed and the count of rows that would
+    move is returned.  Must be called inside an application context.  ``max_batches`` caps
+    the work done by one call so the job can run incrementally.
+    """
+    model = TABLES[table]
+    cfg = current_app.config
+    days = cfg["RETENTION_DAYS"] if days is None else days
+    batch_size = batch_size or cfg["ARCHIVE_BATCH_SIZE"]
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    query = model.query.filter(model.timestamp < cutoff).order_by(model.id)
+
+    # Kept rows stay behind, so page through the expired ones by id
+    moved, batches, last_id, cache = 0, 0, 0, {}
+    while max_batches is None or batches < max_batches:
+        rows = query.filter(model.id > last_id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        keep = _KEEPERS[table](rows, cache)
+        rows = [r for r in rows if r.id not in keep]
+        if rows and not dry_run:
+            _FOLDERS[table](rows)
+            _write_rows(table, rows)
+            for r in rows:
+                db.session.delete(r)
+            db.session.commit()
+
+        moved += len(rows)
+        batches += 1
+    return moved
+
+
+def iter_archive(table: str, since: datetime = None, until: datetime = None):
+    """Yield archived rows of ``table`` as dicts, oldest month first.
+
+    ``since``/``until`` bound the row timestamp (inclusive/exclusive).
+    Duplicate lines left by an interrupted run are skipped.  A rerun
+    rewrites a row into the same month file, so rows are compared by
+    (id, timestamp) within one file: the table may reuse ids once it has
+    been emptied.
+    """
+    if table not in TABLES:
+        raise KeyError(table)
+
+    folder = os.path.join(current_app.config["ARCHIVE_DIR"], table)
+    if not os.path.isdir(folder):
+        return
+
+    for fname in sorted(os.listdir(folder)):
+        if not fname.endswith(".jsonl.gz"):
+            continue
+        month = fname[: -len(".jsonl.gz")]
+        if since and month != "unknown" and month < since.strftime("%Y-%m"):
+            continue
+        if until and month != "unknown" and month > until.strftime("%Y-%m"):
+            continue
+
+        seen = set()
+        with gzip.open(os.path.join(folder, fname), "rt", encoding="utf-8") as f:
+            for line in f:
+                item = json.loads(line)
+                key = (item["id"], item.get("timestamp"))
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                ts = item.get("timestamp")
+                ts = datetime.fromisoformat(ts) if ts else None
+                if since and (ts is None or ts < since):
+                    continue
+                if until and (ts is None or ts >= until):
+                    continue
+                yield item
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Archive old guess_log / score_log rows, or dump the archives.
+
+    python archive_logs.py run [--days 90] [--batch-size 1000] [--max-batches N] [--dry-run]
+    python archive_logs.py query guess_log [--since 2024-01-01] [--until 2024-02-01]
+
+`run` is safe to schedule (e.g. nightly next to update_quiz.py); each batch
+commits on its own, so --max-batches can be used to spread the work out.
+`query` prints archived rows as JSON lines for offline analysis.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from app import create_app
+from app.retention import TABLES, archive_table, iter_archive
+
+
+def _date(s):
+    return datetime.fromisoformat(s)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    run_p = sub.add_parser("run", help="move expired rows into the archive")
+    run_p.add_argument("--table", choices=sorted(TABLES), action="append",
+                       help="limit to one table (repeatable); default: all")
+    run_p.add_argument("--days", type=int, help="retention window (default: RETENTION_DAYS)")
+    run_p.add_argument("--batch-size", type=int)
+    run_p.add_argument("--max-batches", type=int)
+    run_p.add_argument("--dry-run", action="store_true", help="only count expired rows")
+
+    q_p = sub.add_parser("query", help="print archived rows as JSON lines")
+    q_p.add_argument("table", choices=sorted(TABLES))
+    q_p.add_argument("--since", type=_date)
+    q_p.add_argument("--until", type=_date)
+
+    args = parser.parse_args(argv)
+    app = create_app()
+
+    with app.app_context():
+        if args.cmd == "run":
+            for table in args.table or sorted(TABLES):
+                n = archive_table(
+                    table,
+                    days=args.days,
+                    batch_size=args.batch_size,
+                    max_batches=args.max_batches,
+                    dry_run=args.dry_run,
+                )
+                verb = "would archive" if args.dry_run else "archived"
+                print(f"📦 {table}: {verb} {n} rows")
+        else:
+            for item in iter_archive(args.table, since=args.since, until=args.until):
+                sys.stdout.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,4 +18,54 @@ class Config:
         or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
     )
 
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # ------------------------------------------------------------------
+    # Log retention (see archive_logs.py)
+    # ------------------------------------------------------------------
+    RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", 90))
+    ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", os.path.join(_basedir, "instance", "archive"))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get("ARCHIVE_BATCH_SIZE", 1000))
+
+    # ------------------------------------------------------------------
+    # Password hashing & login throttling (see app/auth/hashing.py)
+    # ------------------------------------------------------------------
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    HASH_POOL_WORKERS = int(os.environ.get("HASH_POOL_WORKERS", 2))  # 0 = hash inline
+    HASH_QUEUE_LIMIT = int(os.environ.get("HASH_QUEUE_LIMIT", 8))
+    HASH_TIMEOUT = 5                 # seconds to wait for a queued hash
+    LOGIN_IP_LIMIT = 20              # auth POSTs per IP per window
+    LOGIN_IP_WINDOW = 60
+    LOGIN_USER_LIMIT = 5             # failed logins per username per window
+    LOGIN_USER_WINDOW = 300
+    THROTTLE_MAX_KEYS = 10000        # tracked keys before expired ones are swept
+    # Header carrying the real client IP. Assumes the app runs behind
+    # PythonAnywhere's front-end proxy, which sets X-Real-IP; without it
+    # every request comes from the proxy and shares one IP throttle.
+    # Set to "" when serving directly, where clients could spoof it.
+    CLIENT_IP_HEADER = os.environ.get("CLIENT_IP_HEADER", "X-Real-IP")
+
+    # ------------------------------------------------------------------
+    # Player enrichment DB (built by `generate_quiz.py --refresh-players`)
+    # ------------------------------------------------------------------
+    PLAYER_DB_PATH = os.environ.get("PLAYER_DB_PATH", os.path.join(_basedir, "instance", "players.db"))
+
+    # ------------------------------------------------------------------
+    # Response compression (see app/assets.py)
+    # ------------------------------------------------------------------
+    COMPRESS_MIN_SIZE = 500          # bytes; smaller bodies are sent as-is
+    COMPRESS_LEVEL = 6
+
+    # ------------------------------------------------------------------
+    # Global ladders (see app/ladder.py)
+    # ------------------------------------------------------------------
+    LADDER_SNAPSHOT_PATH = os.environ.get("LADDER_SNAPSHOT_PATH", os.path.join(_basedir, "instance", "ladder.json"))
+    LADDER_WEEK_DAYS = 7
+    LADDER_SNAPSHOT_EVERY = 50       # new score_log rows between snapshots
+
+    # ------------------------------------------------------------------
+    # Quiz rotation
+    # ------------------------------------------------------------------
+    # Submissions for a quiz rotated out less than this many seconds ago
+    # are still graded and logged as live (page opened before rotation).
+    QUIZ_ROTATION_GRACE = int(os.environ.get("QUIZ_ROTATION_GRACE", 900))
@@ -1,6 +1,7 @@
-import json, random, time
+import argparse, json, random, time
 from pathlib import Path
 import pandas as pd
+import player_db
 from rapidfuzz import process, fuzz
 from nba_api.stats.static import players
 from nba_api.stats.endpoints import (
@@ -63,19 +64,62 @@ def match_college_to_conf(school_raw: str):
     return school_raw, "Other", "Other"
 
 
-def get_college_info(player_name: str):
-    match = [p for p in players.get_players() if p["full_name"].lower() == player_name.lower()]
-    if not match:
-        return "Unknown", "Other", "Other", None, "Unknown", "Unknown"
-
-    player_id = match[0]["id"]
+def resolve_player(player_id: int, name: str):
+    """Fetch one player's facts from nba_api and run the college matcher."""
     time.sleep(0.6)
     info_df = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
     school_raw = info_df.iloc[0].get("SCHOOL", "Unknown")
     position = info_df.iloc[0].get("POSITION", "Unknown")
     country = info_df.iloc[0].get("COUNTRY", "Unknown")
     school, school_type, conf = match_college_to_conf(school_raw)
-    return school, school_type, conf, player_id, position, country
+    return {
+        "player_id": int(player_id),
+        "name": name,
+        "school": school,
+        "school_type": school_type,
+        "conference": conf,
+        "position": position,
+        "country": country,
+        "school_raw": school_raw,
+    }
+
+
+def get_players_info(conn, starters):
+    """Bulk-join starters (PLAYER_ID/PLAYER_NAME) against the player DB.
+
+    Players not stored yet are resolved live once and written back.
+    """
+    ids = [int(pid) for pid in starters["PLAYER_ID"]]
+    found = player_db.lookup_ids(conn, ids)
+    fresh = [
+        resolve_player(pid, name)
+        for pid, name in zip(ids, starters["PLAYER_NAME"])
+        if pid not in found
+    ]
+    if fresh:
+        player_db.upsert_players(conn, fresh)
+        found.update({p["player_id"]: p for p in fresh})
+    return found
+
+
+def refresh_player_db(conn, full=False):
+    """Resolve every nba_api player not in the DB yet (or all if ``full``)."""
+    known = set() if full else player_db.known_ids(conn)
+    todo = [p for p in players.get_players() if p["id"] not in known]
+    print(f"Resolving {len(todo)} players")
+    batch = []
+    for p in todo:
+        try:
+            batch.append(resolve_player(p["id"], p["full_name"]))
+        except Exception as e:
+            print(f"Skipping {p['full_name']} due to: {e}")
+            continue
+        # Flush regularly so an interrupted run keeps its progress
+        if len(batch) >= 50:
+            player_db.upsert_players(conn, batch)
+            batch = []
+    if batch:
+        player_db.upsert_players(conn, batch)
 
 
 def get_all_game_ids(season: str):
@@ -84,7 +128,7 @@ def get_all_game_ids(season: str):
     return gl.get_data_frames()[0]["GAME_ID"].unique().tolist()
 
 
-def generate_quiz_from_season(season, save_dir):
+def generate_quiz_from_season(season, save_dir, conn):
     game_ids = get_all_game_ids(season)
     random.shuffle(game_ids)
     for game_id in game_ids:
@@ -139,9 +183,12 @@ def generate_quiz_from_season(season, save_dir):
                     "players": []
                 }
 
+                info = get_players_info(conn, team_starters)
                 for _, row in team_starters.iterrows():
                     name = row["PLAYER_NAME"]
-                    school, typ, conf, pid, pos, country = get_college_info(name)
+                    p = info[int(row["PLAYER_ID"])]
+                    school, typ, conf = p["school"], p["school_type"], p["conference"]
+                    pid, pos, country = p["player_id"], p["position"], p["country"]
                     pts, ast, reb = row["PTS"], row["AST"], row["REB"]
                     stl, blk = row["STL"], row["BLK"]
                     defense = stl + blk
@@ -180,16 +227,28 @@ def generate_quiz_from_season(season, save_dir):
     return False
 
 
-def generate_quizzes_all_seasons():
+def generate_quizzes_all_seasons(conn):
     save_dir = Path("app/static/preloaded_quizzes")
     save_dir.mkdir(parents=True, exist_ok=True)
     seasons = [f"{year}-{str(year+1)[-2:]}" for year in range(2010, 2024)]
     saved = 0
     while saved < 30:
         season = random.choice(seasons)
-        if generate_quiz_from_season(season, save_dir):
+        if generate_quiz_from_season(season, save_dir, conn):
             saved += 1
 
 
 if __name__ == "__main__":
-    generate_quizzes_all_seasons()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--refresh-players", action="store_true",
+                        help="fill the player DB with players not stored yet, then exit")
+    parser.add_argument("--all", action="store_true",
+                        help="with --refresh-players, re-resolve every player")
+    parser.add_argument("--player-db", help=f"default: {player_db.DEFAULT_PATH}")
+    args = parser.parse_args()
+
+    conn = player_db.connect(args.player_db)
+    if args.refresh_players:
+        refresh_player_db(conn, full=args.all)
+    else:
+        generate_quizzes_all_seasons(conn)
@@ -0,0 +1,112 @@
+"""
+player_db.py
+------------
+Local SQLite store of resolved player facts (school, school type,
+conference, country, position) keyed by nba_api player_id.
+
+Shared by generate_quiz.py, which fills it and joins against it in bulk,
+and by the web app, which reads it for hint/metadata lookups.  Uses only
+the stdlib so the web app doesn't pull in pandas or nba_api.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_PATH = os.environ.get(
+    "PLAYER_DB_PATH", os.path.join(PROJECT_ROOT, "instance", "players.db")
+)
+
+FIELDS = ("player_id", "name", "school", "school_type", "conference", "position", "country")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player (
+    player_id   INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    name_key    TEXT NOT NULL,
+    school      TEXT,
+    school_type TEXT,
+    conference  TEXT,
+    position    TEXT,
+    country     TEXT,
+    school_raw  TEXT,
+    updated_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_player_name_key ON player (name_key);
+"""
+
+# SQLite's default host-parameter limit is 999
+_CHUNK = 500
+
+
+def _key(name: str) -> str:
+    return name.strip().lower()
+
+
+def connect(path: str = None, readonly: bool = False) -> sqlite3.Connection:
+    """Open the player DB, creating the schema unless ``readonly``."""
+    path = path or DEFAULT_PATH
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.executescript(_SCHEMA)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def upsert_players(conn, rows) -> int:
+    """Insert or replace player dicts (keys from FIELDS, plus optional school_raw)."""
+    now = datetime.utcnow().isoformat(timespec="seconds")
+    data = [
+        (
+            int(r["player_id"]), r["name"], _key(r["name"]),
+            r.get("school"), r.get("school_type"), r.get("conference"),
+            r.get("position"), r.get("country"), r.get("school_raw"), now,
+        )
+        for r in rows
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO player (player_id, name, name_key, school, school_type,"
+            " conference, position, country, school_raw, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            data,
+        )
+    return len(data)
+
+
+def _select_in(conn, column, values):
+    values = list(values)
+    for i in range(0, len(values), _CHUNK):
+        chunk = values[i:i + _CHUNK]
+        marks = ",".join("?" * len(chunk))
+        yield from conn.execute(
+            f"SELECT {', '.join(FIELDS)}, name_key FROM player WHERE {column} IN ({marks})",
+            chunk,
+        )
+
+
+def lookup_ids(conn, player_ids) -> dict:
+    """Return {player_id: player dict} for every id that is stored."""
+    return {
+        r["player_id"]: {f: r[f] for f in FIELDS}
+        for r in _select_in(conn, "player_id", {int(p) for p in player_ids})
+    }
+
+
+def lookup_names(conn, names) -> dict:
+    """Return {lower-cased name: [player dict, ...]}; case-insensitive match.
+
+    Full names aren't unique in nba_api, so every match is returned.
+    Prefer lookup_ids() whenever the player_id is known.
+    """
+    out = {}
+    for r in _select_in(conn, "name_key", {_key(n) for n in names}):
+        out.setdefault(r["name_key"], []).append({f: r[f] for f in FIELDS})
+    return out
+
+
+def known_ids(conn) -> set:
+    return {r[0] for r in conn.execute("SELECT player_id FROM player")}
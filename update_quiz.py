@@ -3,27 +3,36 @@ import os
 import random
 import shutil
 import sys
+import time
 
 # ─── CONFIGURATION ─────────────────────────────────────────────────────────────
 # Change these if your folder layout differs
 PROJECT_ROOT   = os.path.abspath(os.path.dirname(__file__))  # /home/devgreeny/starting5_v3
 PRELOADED_DIR  = os.path.join(PROJECT_ROOT, "app", "static", "preloaded_quizzes")
 CURRENT_DIR    = os.path.join(PROJECT_ROOT, "app", "static", "current_quiz")
+PAST_DIR       = os.path.join(PROJECT_ROOT, "app", "static", "past_quizzes")
 # ────────────────────────────────────────────────────────────────────────────────
 
 def main():
-    # 1) Ensure the current_quiz folder exists
+    # 1) Ensure the current_quiz and past_quizzes folders exist
     os.makedirs(CURRENT_DIR, exist_ok=True)
+    os.makedirs(PAST_DIR, exist_ok=True)
 
-    # 2) Remove any existing file in CURRENT_DIR
+    # 2) Retire any existing file in CURRENT_DIR to PAST_DIR (the archive);
+    #    its mtime records when it was rotated out. Stamp it *before* the
+    #    move: the app's archive index only rebuilds when PAST_DIR changes,
+    #    and touching the file afterwards doesn't change the directory.
     existing = [f for f in os.listdir(CURRENT_DIR) if f.lower().endswith(".json")]
     for old_file in existing:
         old_path = os.path.join(CURRENT_DIR, old_file)
+        past_path = os.path.join(PAST_DIR, old_file)
         try:
-            os.remove(old_path)
-            print(f"🗑️ Removed old quiz: {old_file}")
+            now = time.time()
+            os.utime(old_path, (now, now))
+            shutil.move(old_path, past_path)  # a rename keeps the mtime
+            print(f"📦 Archived old quiz: {old_file}")
         except Exception as e:
-            print(f"⚠️ Could not remove '{old_file}': {e}", file=sys.stderr)
+            print(f"⚠️ Could not archive '{old_file}': {e}", file=sys.stderr)
 
     # 3) List all remaining quizzes in PRELOADED_DIR
     all_quizzes = [f for f in os.listdir(PRELOADED_DIR) if f.lower().endswith(".json")]